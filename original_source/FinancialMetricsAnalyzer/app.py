@@ -1,9 +1,27 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-from components.calculator import render_calculator
-from components.simulator import render_simulator
-from components.education import render_education
+
+# Page modules are imported on first visit so unused pages (and their
+# plotting and simulation dependencies) stay out of the cold start.
+# Python caches imported modules, so later visits are a dict lookup.
+def _get_calculator():
+    from components.calculator import render_calculator
+    return render_calculator
+
+def _get_simulator():
+    from components.simulator import render_simulator
+    return render_simulator
+
+def _get_education():
+    from components.education import render_education
+    return render_education
+
+PAGES = {
+    "📊 Interactive Calculator": _get_calculator,
+    "🎲 Monte Carlo Simulator": _get_simulator,
+    "📚 Educational Content": _get_education
+}
 
 # Configure page
 st.set_page_config(
@@ -30,16 +48,12 @@ def main():
     st.sidebar.title("Navigation")
     page = st.sidebar.selectbox(
         "Choose a section:",
-        ["📊 Interactive Calculator", "🎲 Monte Carlo Simulator", "📚 Educational Content"]
+        list(PAGES)
     )
     
     # Main content area
-    if page == "📊 Interactive Calculator":
-        render_calculator()
-    elif page == "🎲 Monte Carlo Simulator":
-        render_simulator()
-    elif page == "📚 Educational Content":
-        render_education()
+    render_page = PAGES[page]()
+    render_page()
     
     # Footer
     st.markdown("---")
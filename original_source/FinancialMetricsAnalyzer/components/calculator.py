@@ -1,7 +1,6 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
-from utils.calculations import calculate_volatility_scenarios, calculate_single_scenario_outcomes
+from utils.calculations import calculate_volatility_scenario_range, calculate_single_scenario_outcomes
 from utils.visualizations import create_return_comparison_chart, create_outcome_tree_chart
 
 def render_calculator():
@@ -20,42 +19,45 @@ def render_calculator():
     with col1:
         st.subheader("🎯 Single Scenario Analysis")
         
-        # Input parameters for single scenario
-        st.markdown("**Define your investment scenario:**")
-        
-        up_return = st.slider(
-            "Up scenario return (%)",
-            min_value=-50,
-            max_value=200,
-            value=100,
-            step=5,
-            help="Return in the favorable outcome"
-        ) / 100
-        
-        down_return = st.slider(
-            "Down scenario return (%)",
-            min_value=-90,
-            max_value=50,
-            value=-60,
-            step=5,
-            help="Return in the unfavorable outcome"
-        ) / 100
-        
-        prob_up = st.slider(
-            "Probability of up scenario (%)",
-            min_value=1,
-            max_value=99,
-            value=50,
-            step=1,
-            help="Probability of the favorable outcome occurring"
-        ) / 100
-        
-        periods = st.selectbox(
-            "Number of periods to analyze",
-            options=[1, 2, 3, 4, 5],
-            index=1,
-            help="Number of investment periods (e.g., years)"
-        )
+        # Input parameters for single scenario, applied together on submit
+        with st.form("single_scenario"):
+            st.markdown("**Define your investment scenario:**")
+            
+            up_return = st.slider(
+                "Up scenario return (%)",
+                min_value=-50,
+                max_value=200,
+                value=100,
+                step=5,
+                help="Return in the favorable outcome"
+            ) / 100
+            
+            down_return = st.slider(
+                "Down scenario return (%)",
+                min_value=-90,
+                max_value=50,
+                value=-60,
+                step=5,
+                help="Return in the unfavorable outcome"
+            ) / 100
+            
+            prob_up = st.slider(
+                "Probability of up scenario (%)",
+                min_value=1,
+                max_value=99,
+                value=50,
+                step=1,
+                help="Probability of the favorable outcome occurring"
+            ) / 100
+            
+            periods = st.selectbox(
+                "Number of periods to analyze",
+                options=[1, 2, 3, 4, 5],
+                index=1,
+                help="Number of investment periods (e.g., years)"
+            )
+            
+            st.form_submit_button("Update scenario")
         
         # Calculate single scenario outcomes
         outcomes = calculate_single_scenario_outcomes(up_return, down_return, periods)
@@ -75,20 +77,20 @@ def render_calculator():
             )
             st.metric(
                 "Geometric Mean Return",
-                f"{outcomes['geometric_mean']:.1%}",
-                delta=f"{outcomes['geometric_mean'] - arithmetic_mean:.1%}",
+                f"{outcomes.geometric_mean:.1%}",
+                delta=f"{outcomes.geometric_mean - arithmetic_mean:.1%}",
                 help="Compound annual growth rate"
             )
         
         with metrics_col2:
             st.metric(
                 "Median CAGR",
-                f"{outcomes['median_cagr']:.1%}",
+                f"{outcomes.median_cagr:.1%}",
                 help="Middle value of all possible CAGRs"
             )
             st.metric(
                 "Probability of Loss",
-                f"{outcomes['prob_loss']:.1%}",
+                f"{outcomes.prob_loss:.1%}",
                 help="Chance of losing money over the period"
             )
         
@@ -109,39 +111,41 @@ def render_calculator():
             - Number of periods: {periods}
             
             **Calculated Metrics:**
-            - Best case terminal value: {outcomes['best_case']:.3f}x
-            - Worst case terminal value: {outcomes['worst_case']:.3f}x
-            - Mean terminal value: {outcomes['mean_terminal']:.3f}x
-            - Median terminal value: {outcomes['median_terminal']:.3f}x
+            - Best case terminal value: {outcomes.best_case:.3f}x
+            - Worst case terminal value: {outcomes.worst_case:.3f}x
+            - Mean terminal value: {outcomes.mean_terminal:.3f}x
+            - Median terminal value: {outcomes.median_terminal:.3f}x
             """)
     
     with col2:
         st.subheader("📈 Volatility Impact Analysis")
         
-        # Input for volatility analysis
-        st.markdown("**Compare different volatility levels:**")
-        
-        target_return = st.slider(
-            "Target arithmetic mean return (%)",
-            min_value=1,
-            max_value=50,
-            value=20,
-            step=1,
-            help="The arithmetic mean return to maintain across all scenarios"
-        ) / 100
-        
-        max_volatility = st.slider(
-            "Maximum volatility ratio",
-            min_value=1.1,
-            max_value=10.0,
-            value=5.0,
-            step=0.1,
-            help="Highest ratio of up return to down return to analyze"
-        )
+        # Input for volatility analysis, applied together on submit
+        with st.form("volatility_analysis"):
+            st.markdown("**Compare different volatility levels:**")
+            
+            target_return = st.slider(
+                "Target arithmetic mean return (%)",
+                min_value=1,
+                max_value=50,
+                value=20,
+                step=1,
+                help="The arithmetic mean return to maintain across all scenarios"
+            ) / 100
+            
+            max_volatility = st.slider(
+                "Maximum volatility ratio",
+                min_value=1.1,
+                max_value=10.0,
+                value=5.0,
+                step=0.1,
+                help="Highest ratio of up return to down return to analyze"
+            )
+            
+            st.form_submit_button("Update analysis")
         
         # Generate volatility scenarios
-        volatility_ratios = np.linspace(1.1, max_volatility, 20)
-        scenarios_df = calculate_volatility_scenarios(target_return, volatility_ratios)
+        scenarios_df = calculate_volatility_scenario_range(target_return, 1.1, max_volatility, 20)
         
         # Display volatility comparison chart
         st.plotly_chart(
@@ -152,8 +156,9 @@ def render_calculator():
         # Key insights
         st.markdown("**Key Insights:**")
         
-        min_geometric = scenarios_df['geometric_mean_2period'].min()
-        max_geometric = scenarios_df['geometric_mean_2period'].max()
+        geometric_means = scenarios_df['geometric_mean_2period'].to_numpy()
+        min_geometric = geometric_means.min()
+        max_geometric = geometric_means.max()
         
         st.info(f"""
         📊 **Volatility Impact Summary:**
@@ -167,15 +172,16 @@ def render_calculator():
         
         # Scenarios table
         with st.expander("📊 Detailed Scenarios Table"):
-            display_df = scenarios_df.copy()
-            display_df['up_return'] = display_df['up_return'].apply(lambda x: f"{x:.1%}")
-            display_df['down_return'] = display_df['down_return'].apply(lambda x: f"{x:.1%}")
-            display_df['geometric_mean_2period'] = display_df['geometric_mean_2period'].apply(lambda x: f"{x:.1%}")
-            display_df['median_return_2period'] = display_df['median_return_2period'].apply(lambda x: f"{x:.1%}")
-            
+            # Styler formats at render time without copying or mutating the data
             st.dataframe(
-                display_df[['volatility_ratio', 'up_return', 'down_return', 
-                           'geometric_mean_2period', 'median_return_2period']].round(3),
+                scenarios_df[['volatility_ratio', 'up_return', 'down_return', 
+                              'geometric_mean_2period', 'median_return_2period']].style.format({
+                    'volatility_ratio': '{:.3f}',
+                    'up_return': '{:.1%}',
+                    'down_return': '{:.1%}',
+                    'geometric_mean_2period': '{:.1%}',
+                    'median_return_2period': '{:.1%}'
+                }),
                 column_config={
                     'volatility_ratio': 'Volatility Ratio',
                     'up_return': 'Up Return',
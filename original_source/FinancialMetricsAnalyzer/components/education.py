@@ -1,9 +1,59 @@
+import copy
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
+from functools import lru_cache
 from utils.calculations import calculate_single_scenario_outcomes
 
+# Final challenge scenarios use fixed inputs, so compute them once at import
+_FINAL_CHALLENGE_A = calculate_single_scenario_outcomes(0.30, 0.10, 2)
+_FINAL_CHALLENGE_B = calculate_single_scenario_outcomes(0.80, -0.40, 2)
+
+@lru_cache(maxsize=None)
+def _mult_fig_template():
+    """Build the multiplicative vs additive growth chart with empty traces"""
+    
+    # Plotly is only needed for this chart, so import it on first use
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        mode='lines+markers',
+        name='Multiplicative (Compounding)',
+        line=dict(color='blue', width=3)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        mode='lines+markers',
+        name='Additive (No Compounding)',
+        line=dict(color='red', width=3, dash='dash')
+    ))
+    
+    fig.update_layout(
+        title='Multiplicative vs Additive Growth',
+        xaxis_title='Years',
+        yaxis_title='Value Multiple',
+        height=400
+    )
+    
+    return fig
+
+@st.cache_resource(max_entries=64)
+def _get_growth_fig(years: int, annual_return: float):
+    """Fill a copy of the growth chart template for the given horizon and return"""
+    
+    # Calculate multiplicative vs additive growth
+    years_arr = np.arange(years + 1)
+    
+    fig = copy.deepcopy(_mult_fig_template())
+    fig.data[0].x = years_arr
+    fig.data[0].y = (1 + annual_return) ** years_arr
+    fig.data[1].x = years_arr
+    fig.data[1].y = 1 + annual_return * years_arr
+    
+    return fig
+
 def render_education():
     """Render the educational content page"""
     
@@ -89,39 +139,10 @@ def render_education():
         years = st.slider("Number of years", 1, 20, 10, key="mult_years")
         annual_return = st.slider("Annual return (%)", 1, 20, 10, key="mult_return") / 100
         
-        # Calculate multiplicative vs additive growth
-        multiplicative_values = [(1 + annual_return) ** year for year in range(years + 1)]
-        additive_values = [1 + annual_return * year for year in range(years + 1)]
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=list(range(years + 1)),
-            y=multiplicative_values,
-            mode='lines+markers',
-            name='Multiplicative (Compounding)',
-            line=dict(color='blue', width=3)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=list(range(years + 1)),
-            y=additive_values,
-            mode='lines+markers',
-            name='Additive (No Compounding)',
-            line=dict(color='red', width=3, dash='dash')
-        ))
-        
-        fig.update_layout(
-            title='Multiplicative vs Additive Growth',
-            xaxis_title='Years',
-            yaxis_title='Value Multiple',
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_get_growth_fig(years, annual_return), use_container_width=True)
         
-        final_mult = multiplicative_values[-1]
-        final_add = additive_values[-1]
+        final_mult = (1 + annual_return) ** years
+        final_add = 1 + annual_return * years
         
         st.markdown(f"""
         **After {years} years:**
@@ -143,31 +164,37 @@ def render_education():
         # Demonstrate volatility drag
         st.markdown("**Example from the original article:**")
         
-        scenarios = [
-            {"name": "Low Volatility", "up": 0.21, "down": 0.19, "prob": 0.5},
-            {"name": "High Volatility", "up": 1.00, "down": -0.60, "prob": 0.5}
-        ]
-        
-        results_comparison = []
+        scenario_names = ["Low Volatility", "High Volatility"]
+        up_returns = np.array([0.21, 1.00])
+        down_returns = np.array([0.19, -0.60])
         
-        for scenario in scenarios:
-            arithmetic_mean = scenario["prob"] * scenario["up"] + (1 - scenario["prob"]) * scenario["down"]
-            
-            # 2-period outcomes
-            outcomes = calculate_single_scenario_outcomes(scenario["up"], scenario["down"], 2)
-            
-            results_comparison.append({
-                "Scenario": scenario["name"],
-                "Up Return": f"{scenario['up']:.0%}",
-                "Down Return": f"{scenario['down']:.0%}",
-                "Arithmetic Mean": f"{arithmetic_mean:.1%}",
-                "Geometric Mean (2-period)": f"{outcomes['geometric_mean']:.1%}",
-                "Volatility Drag": f"{arithmetic_mean - outcomes['geometric_mean']:.1%}",
-                "Probability of Loss": f"{outcomes['prob_loss']:.1%}"
-            })
+        # 2-period outcomes for both scenarios, served from the cache after the first run
+        outcomes = [
+            calculate_single_scenario_outcomes(up, down, 2)
+            for up, down in zip(up_returns, down_returns)
+        ]
+        arithmetic_means = np.array([o.arithmetic_mean for o in outcomes])
+        geometric_means = np.array([o.geometric_mean for o in outcomes])
+        
+        results_comparison = pd.DataFrame({
+            "Scenario": scenario_names,
+            "Up Return": up_returns,
+            "Down Return": down_returns,
+            "Arithmetic Mean": arithmetic_means,
+            "Geometric Mean (2-period)": geometric_means,
+            "Volatility Drag": arithmetic_means - geometric_means,
+            "Probability of Loss": [o.prob_loss for o in outcomes]
+        })
         
         st.dataframe(
-            pd.DataFrame(results_comparison),
+            results_comparison.style.format({
+                "Up Return": "{:.0%}",
+                "Down Return": "{:.0%}",
+                "Arithmetic Mean": "{:.1%}",
+                "Geometric Mean (2-period)": "{:.1%}",
+                "Volatility Drag": "{:.1%}",
+                "Probability of Loss": "{:.1%}"
+            }),
             use_container_width=True,
             hide_index=True
         )
@@ -209,29 +236,20 @@ def render_education():
         with col1:
             st.markdown("**Summary Statistics:**")
             st.metric("Arithmetic Mean", f"{(up_ret + down_ret) / 2:.1%}")
-            st.metric("Geometric Mean", f"{outcomes['geometric_mean']:.1%}")
-            st.metric("Median CAGR", f"{outcomes['median_cagr']:.1%}")
-            st.metric("Probability of Loss", f"{outcomes['prob_loss']:.1%}")
+            st.metric("Geometric Mean", f"{outcomes.geometric_mean:.1%}")
+            st.metric("Median CAGR", f"{outcomes.median_cagr:.1%}")
+            st.metric("Probability of Loss", f"{outcomes.prob_loss:.1%}")
         
         with col2:
             st.markdown("**All Possible Outcomes:**")
             
-            # Create outcomes table
-            outcome_data = []
-            for i, (sequence, terminal_val, cagr) in enumerate(zip(
-                outcomes['sequences'], 
-                outcomes['terminal_values'], 
-                outcomes['cagr_values']
-            )):
-                path_description = " → ".join([f"{r:+.0%}" for r in sequence])
-                outcome_data.append({
-                    "Path": path_description,
-                    "Terminal Value": f"{terminal_val:.3f}x",
-                    "CAGR": f"{cagr:.1%}"
-                })
-            
+            # Create outcomes table, formatting every column in vectorized passes
             st.dataframe(
-                pd.DataFrame(outcome_data),
+                pd.DataFrame({
+                    "Path": outcomes.path_labels,
+                    "Terminal Value": np.char.mod('%.3fx', outcomes.terminal_values),
+                    "CAGR": np.char.mod('%.1f%%', outcomes.cagr_values * 100)
+                }),
                 use_container_width=True,
                 hide_index=True
             )
@@ -239,9 +257,9 @@ def render_education():
         st.markdown(f"""
         **Interpretation:**
         - There are {2**periods} equally likely outcomes
-        - Median outcome: {outcomes['median_cagr']:.1%} CAGR
-        - Best case: {outcomes['best_case']:.2f}x your money
-        - Worst case: {outcomes['worst_case']:.2f}x your money
+        - Median outcome: {outcomes.median_cagr:.1%} CAGR
+        - Best case: {outcomes.best_case:.2f}x your money
+        - Worst case: {outcomes.worst_case:.2f}x your money
         """)
     
     with tab5:
@@ -315,10 +333,8 @@ def render_education():
             - Low volatility
             """)
             
-            outcomes_a = calculate_single_scenario_outcomes(0.30, 0.10, 2)
-            
             st.metric("Arithmetic Mean", "20%")
-            st.metric("2-Period Geometric Mean", f"{outcomes_a['geometric_mean']:.1%}")
+            st.metric("2-Period Geometric Mean", f"{_FINAL_CHALLENGE_A.geometric_mean:.1%}")
         
         with challenge_col2:
             st.markdown("""
@@ -328,16 +344,14 @@ def render_education():
             - High volatility
             """)
             
-            outcomes_b = calculate_single_scenario_outcomes(0.80, -0.40, 2)
-            
             st.metric("Arithmetic Mean", "20%")
-            st.metric("2-Period Geometric Mean", f"{outcomes_b['geometric_mean']:.1%}")
+            st.metric("2-Period Geometric Mean", f"{_FINAL_CHALLENGE_B.geometric_mean:.1%}")
         
         st.markdown(f"""
         **Question:** Both investments have the same 20% arithmetic mean return. 
         Which would you choose for a 2-year investment?
         
-        **Answer:** Investment A provides a {outcomes_a['geometric_mean']:.1%} geometric return 
-        vs {outcomes_b['geometric_mean']:.1%} for Investment B. The lower volatility of 
+        **Answer:** Investment A provides a {_FINAL_CHALLENGE_A.geometric_mean:.1%} geometric return 
+        vs {_FINAL_CHALLENGE_B.geometric_mean:.1%} for Investment B. The lower volatility of 
         Investment A results in better compounded returns despite identical arithmetic means.
         """)
@@ -1,5 +1,4 @@
 import streamlit as st
-import numpy as np
 import pandas as pd
 from utils.calculations import simulate_investment_paths
 from utils.visualizations import (
@@ -141,7 +140,7 @@ def render_simulator():
                 )
             
             with stat_col3:
-                median_cagr = np.median(results['cagr_values'])
+                median_cagr = results['median_cagr']
                 st.metric(
                     "Median CAGR",
                     f"{median_cagr:.1%}",
@@ -1,7 +1,28 @@
 import numpy as np
 import pandas as pd
+import streamlit as st
+from dataclasses import dataclass
+from functools import lru_cache, reduce
+from math import comb
+from numba import njit
 from typing import List, Tuple, Dict
-from scipy import stats
+
+@dataclass(frozen=True)
+class ScenarioOutcomes:
+    """All possible outcomes of a single up/down scenario and their statistics"""
+    
+    sequences: np.ndarray  # (paths, periods) return in each period
+    terminal_values: np.ndarray  # (paths,) terminal wealth multiple
+    cagr_values: np.ndarray  # (paths,) compound annual growth rate
+    path_labels: np.ndarray  # (paths,) e.g. "+50% → -20%"
+    arithmetic_mean: float
+    geometric_mean: float
+    median_cagr: float
+    mean_terminal: float
+    median_terminal: float
+    prob_loss: float
+    worst_case: float
+    best_case: float
 
 def calculate_arithmetic_return(returns: List[float]) -> float:
     """Calculate arithmetic mean return"""
@@ -9,29 +30,71 @@ def calculate_arithmetic_return(returns: List[float]) -> float:
 
 def calculate_geometric_return(returns: List[float]) -> float:
     """Calculate geometric mean return (CAGR)"""
-    # Convert returns to multiplicative factors
-    factors = [1 + r for r in returns]
-    geometric_mean = np.prod(factors) ** (1/len(factors)) - 1
-    return geometric_mean
+    # Average the log growth factors rather than taking a root of their product
+    log_factors = np.log1p(np.asarray(returns, dtype=np.float64))
+    return np.expm1(log_factors.mean())
 
 def calculate_log_return(returns: List[float]) -> float:
     """Calculate log return (continuous compounding)"""
-    # Convert returns to multiplicative factors and take log
-    factors = [1 + r for r in returns]
-    log_returns = [np.log(factor) for factor in factors]
-    return np.mean(log_returns)
+    # Log of the multiplicative factors, computed without forming 1 + r
+    return np.log1p(np.asarray(returns, dtype=np.float64)).mean()
+
+# Number of simulated paths kept per-period for the path chart
+_MAX_DISPLAY_PATHS = 1000
+
+# Longest horizon whose statistics are computed from the exact binomial
+# distribution instead of the simulated sample
+_MAX_EXACT_PERIODS = 40
+
+@njit(cache=True)
+def _simulate_paths_kernel(
+    initial_value: float,
+    up_factor: float,
+    down_factor: float,
+    ups: np.ndarray,
+    paths: np.ndarray
+) -> None:
+    """Compound each simulated path from its (periods,) row of up/down outcomes into paths"""
+    for i in range(ups.shape[0]):
+        value = initial_value
+        paths[i, 0] = value
+        for period in range(ups.shape[1]):
+            if ups[i, period]:
+                value *= up_factor
+            else:
+                value *= down_factor
+            paths[i, period + 1] = value
 
+# Compile the kernel at import rather than on the first simulation
+_simulate_paths_kernel(1.0, 1.1, 0.9, np.zeros((2, 1), dtype=np.bool_), np.empty((2, 2), dtype=np.float32))
+
+def _draw_outcomes(rng: np.random.Generator, prob_up: float, num_paths: int, periods: int) -> np.ndarray:
+    """Draw a (num_paths, periods) table of up (True) / down (False) outcomes"""
+    if abs(prob_up - 0.5) < 1e-9:
+        # A fair coin needs one random bit per outcome, so unpack raw
+        # generator bytes instead of drawing and comparing doubles
+        num_draws = num_paths * periods
+        raw = np.frombuffer(rng.bytes(-(-num_draws // 8)), dtype=np.uint8)
+        return np.unpackbits(raw, count=num_draws).view(np.bool_).reshape(num_paths, periods)
+    return rng.random((num_paths, periods)) < prob_up
+
+@st.cache_data(show_spinner=False, max_entries=16)
 def simulate_investment_paths(
     initial_value: float,
     up_return: float,
     down_return: float,
     prob_up: float,
     periods: int,
-    num_simulations: int = 10000
+    num_simulations: int = 10000,
+    seed: int = 0,
+    return_paths: bool = True
 ) -> Dict:
     """
     Simulate multiple investment paths using Monte Carlo
     
+    Up to _MAX_EXACT_PERIODS periods the summary statistics are exact
+    binomial results; the simulated sample drives the distributions.
+    
     Args:
         initial_value: Starting investment amount
         up_return: Return in up scenario (as decimal, e.g., 0.21 for 21%)
@@ -39,55 +102,98 @@ def simulate_investment_paths(
         prob_up: Probability of up scenario
         periods: Number of investment periods
         num_simulations: Number of Monte Carlo simulations
+        seed: Seed for the random generator, so repeated runs are reproducible
+        return_paths: Whether to build the per-period paths used for visualization
     
     Returns:
         Dictionary with simulation results
     """
     
-    # Run simulations
-    final_values = []
-    all_paths = []
+    rng = np.random.default_rng(seed)
     
-    for _ in range(num_simulations):
-        value = initial_value
-        path = [value]
-        
-        for period in range(periods):
-            # Generate random outcome
-            if np.random.random() < prob_up:
-                value *= (1 + up_return)
-            else:
-                value *= (1 + down_return)
-            path.append(value)
-        
-        final_values.append(value)
-        all_paths.append(path)
+    # Only the paths that can be drawn need period-by-period outcomes; they
+    # are compounded in a single compiled pass. Values are only shown to
+    # a few significant digits, so the stored arrays are float32
+    num_paths = min(num_simulations, _MAX_DISPLAY_PATHS) if return_paths else 0
+    ups = _draw_outcomes(rng, prob_up, num_paths, periods)
+    all_paths = np.empty((num_paths, periods + 1), dtype=np.float32)
+    _simulate_paths_kernel(float(initial_value), 1 + up_return, 1 + down_return, ups, all_paths)
     
-    # Calculate statistics
-    final_values = np.array(final_values)
-    cagr_values = (final_values / initial_value) ** (1/periods) - 1
+    # A final value only depends on the number of ups, which is
+    # Binomial(periods, prob_up), so the rest of the population draws that
+    # count directly instead of materializing its outcomes
+    num_ups = np.concatenate([
+        np.count_nonzero(ups, axis=1),
+        rng.binomial(periods, prob_up, size=num_simulations - num_paths)
+    ])
+    
+    # Paths with the same number of ups share a final value, so the
+    # periods + 1 possible values are computed once and gathered by up count
+    outcome_ups = np.arange(periods + 1)
+    outcome_values = initial_value * (1 + up_return) ** outcome_ups * (1 + down_return) ** (periods - outcome_ups)
+    outcome_cagrs = (outcome_values / initial_value) ** (1/periods) - 1
+    final_values = outcome_values[num_ups]
+    cagr_values = outcome_cagrs[num_ups]
     
     # Expected arithmetic return
     arithmetic_expected = prob_up * up_return + (1 - prob_up) * down_return
     
-    # Calculate percentiles for final values
     percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
-    value_percentiles = np.percentile(final_values, percentiles)
-    cagr_percentiles = np.percentile(cagr_values, percentiles)
+    quantiles = np.divide(percentiles, 100)
+    
+    if periods <= _MAX_EXACT_PERIODS:
+        # The number of ups is exactly Binomial(periods, prob_up), so the
+        # statistics come from its periods + 1 outcomes rather than from the
+        # sample, which only feeds the histograms and the path chart. Both
+        # use the same outcome_values table, so they cannot disagree
+        outcome_probs = (
+            _binomial_counts(periods)
+            * prob_up ** outcome_ups
+            * (1 - prob_up) ** (periods - outcome_ups)
+        )
+        
+        # Percentiles are the exact inverse CDF, with slack for rounding
+        # in the cumulative sum
+        order = np.argsort(outcome_values, kind='stable')
+        cumulative = np.cumsum(outcome_probs[order])
+        positions = np.searchsorted(cumulative, quantiles - 1e-12)
+        value_percentiles = outcome_values[order[np.minimum(positions, periods)]]
+        
+        mean_final_value = outcome_probs @ outcome_values
+        deviations = outcome_values - mean_final_value
+        std_final_value = np.sqrt(outcome_probs @ (deviations * deviations))
+        prob_loss = outcome_probs[outcome_values < initial_value].sum()
+        prob_double = outcome_probs[outcome_values >= 2 * initial_value].sum()
+    else:
+        value_percentiles = np.quantile(final_values, quantiles)
+        
+        # Summary statistics share one pass for the mean and one for the
+        # spread; the median is already the 50th percentile
+        mean_final_value = final_values.sum() / num_simulations
+        deviations = final_values - mean_final_value
+        std_final_value = np.sqrt(deviations @ deviations / num_simulations)
+        prob_loss = np.count_nonzero(final_values < initial_value) / num_simulations
+        prob_double = np.count_nonzero(final_values >= 2 * initial_value) / num_simulations
+    
+    # CAGR is monotonic in the final value, so its percentiles map across
+    cagr_percentiles = (value_percentiles / initial_value) ** (1/periods) - 1
+    median_index = percentiles.index(50)
     
+    # Statistics above use the float64 values; only storage is downcast
     results = {
-        'final_values': final_values,
-        'cagr_values': cagr_values,
-        'all_paths': all_paths[:1000],  # Store first 1000 paths for visualization
+        'final_values': final_values.astype(np.float32),
+        'cagr_values': cagr_values.astype(np.float32),
+        'all_paths': all_paths,  # First paths only, for visualization
         'arithmetic_expected': arithmetic_expected,
-        'geometric_mean': np.median(cagr_values),
-        'mean_final_value': np.mean(final_values),
-        'median_final_value': np.median(final_values),
-        'std_final_value': np.std(final_values),
+        'geometric_mean': cagr_percentiles[median_index],
+        'median_cagr': cagr_percentiles[median_index],
+        'mean_final_value': mean_final_value,
+        'median_final_value': value_percentiles[median_index],
+        'std_final_value': std_final_value,
         'value_percentiles': dict(zip(percentiles, value_percentiles)),
         'cagr_percentiles': dict(zip(percentiles, cagr_percentiles)),
-        'prob_loss': np.sum(final_values < initial_value) / len(final_values),
-        'prob_double': np.sum(final_values >= 2 * initial_value) / len(final_values)
+        'prob_loss': prob_loss,
+        'prob_double': prob_double
     }
     
     return results
@@ -110,50 +216,116 @@ def calculate_volatility_scenarios(
     if volatility_ratios is None:
         volatility_ratios = [1.1, 1.5, 2.0, 3.0, 4.0, 5.0]
     
-    scenarios = []
+    ratios = np.asarray(volatility_ratios, dtype=np.float64)
     
-    for ratio in volatility_ratios:
-        # For a given mean return and volatility ratio, solve for up/down returns
-        # Let up_return = r_up, down_return = r_down
-        # Constraint 1: 0.5 * r_up + 0.5 * r_down = mean_return
-        # Constraint 2: (1 + r_up) / (1 + r_down) = ratio
-        
-        # From constraint 1: r_down = 2 * mean_return - r_up
-        # Substituting into constraint 2:
-        # (1 + r_up) / (1 + 2 * mean_return - r_up) = ratio
-        # Solving for r_up:
-        
-        denominator = ratio + 1
-        r_up = (ratio * (1 + 2 * mean_return) - 1) / denominator
-        r_down = 2 * mean_return - r_up
-        
-        # Calculate geometric return for 2 periods
-        outcomes_2period = [
-            (1 + r_up) * (1 + r_up),  # up, up
-            (1 + r_up) * (1 + r_down),  # up, down
-            (1 + r_down) * (1 + r_up),  # down, up
-            (1 + r_down) * (1 + r_down)  # down, down
-        ]
-        
-        geometric_2period = np.mean(outcomes_2period) ** 0.5 - 1
-        median_2period = np.median(outcomes_2period) ** 0.5 - 1
-        
-        scenarios.append({
-            'volatility_ratio': ratio,
-            'up_return': r_up,
-            'down_return': r_down,
-            'arithmetic_mean': mean_return,
-            'geometric_mean_2period': geometric_2period,
-            'median_return_2period': median_2period,
-            'terminal_wealth_up_up': outcomes_2period[0],
-            'terminal_wealth_up_down': outcomes_2period[1],
-            'terminal_wealth_down_down': outcomes_2period[3],
-            'volatility_description': f"±{abs(r_up - mean_return):.1%}"
-        })
-    
-    return pd.DataFrame(scenarios)
-
-def calculate_single_scenario_outcomes(up_return: float, down_return: float, periods: int = 2) -> Dict:
+    # For a given mean return and volatility ratio, solve for up/down returns
+    # Let up_return = r_up, down_return = r_down
+    # Constraint 1: 0.5 * r_up + 0.5 * r_down = mean_return
+    # Constraint 2: (1 + r_up) / (1 + r_down) = ratio
+    
+    # From constraint 1: r_down = 2 * mean_return - r_up
+    # Substituting into constraint 2:
+    # (1 + r_up) / (1 + 2 * mean_return - r_up) = ratio
+    # Solving for r_up (for every ratio at once):
+    
+    r_up = (ratios * (1 + 2 * mean_return) - 1) / (ratios + 1)
+    r_down = 2 * mean_return - r_up
+    
+    # The four 2-period outcomes are up-up, up-down, down-up and down-down,
+    # where up-down and down-up are equal
+    up_up = (1 + r_up) * (1 + r_up)
+    up_down = (1 + r_up) * (1 + r_down)
+    down_down = (1 + r_down) * (1 + r_down)
+    
+    # Median of {up_up, up_down, up_down, down_down}: the two middle values
+    # are up_down and up_down clipped into [min, max] of the other two
+    lower = np.minimum(up_up, down_down)
+    upper = np.maximum(up_up, down_down)
+    median_outcome = 0.5 * (up_down + np.clip(up_down, lower, upper))
+    
+    return pd.DataFrame({
+        'volatility_ratio': ratios,
+        'up_return': r_up,
+        'down_return': r_down,
+        'arithmetic_mean': mean_return,
+        'geometric_mean_2period': np.sqrt(0.25 * (up_up + 2 * up_down + down_down)) - 1,
+        'median_return_2period': np.sqrt(median_outcome) - 1,
+        'terminal_wealth_up_up': up_up,
+        'terminal_wealth_up_down': up_down,
+        'terminal_wealth_down_down': down_down,
+        'volatility_description': [f"±{abs(r - mean_return):.1%}" for r in r_up]
+    })
+
+@st.cache_data(max_entries=256)
+def calculate_volatility_scenario_range(
+    mean_return: float,
+    min_ratio: float,
+    max_ratio: float,
+    num_ratios: int = 20
+) -> pd.DataFrame:
+    """
+    Calculate volatility scenarios for evenly spaced volatility ratios
+    
+    Takes only scalar arguments so Streamlit can cache the result cheaply
+    across reruns.
+    
+    Args:
+        mean_return: Target arithmetic mean return
+        min_ratio: Lowest volatility ratio to analyze
+        max_ratio: Highest volatility ratio to analyze
+        num_ratios: Number of ratios between min_ratio and max_ratio
+    
+    Returns:
+        DataFrame with scenario analysis
+    """
+    
+    volatility_ratios = np.linspace(min_ratio, max_ratio, num_ratios)
+    return calculate_volatility_scenarios(mean_return, volatility_ratios)
+
+def _outcome_mask(periods: int) -> np.ndarray:
+    """
+    Build the (2**periods, periods) up/down table of all outcome sequences
+    
+    Rows follow itertools.product([up, down], repeat=periods) ordering, so
+    True (up) comes before False (down) and the first period varies slowest.
+    """
+    # Path indices fit in uint8 for up to 8 periods, so keep the bit table small
+    index_dtype = np.min_scalar_type((1 << periods) - 1)
+    shifts = np.arange(periods - 1, -1, -1, dtype=index_dtype)
+    bits = (np.arange(1 << periods, dtype=index_dtype)[:, None] >> shifts) & 1
+    return bits == 0
+
+# Masks for the period counts offered in the UI, built once at import
+_OUTCOME_MASKS = {periods: _outcome_mask(periods) for periods in range(1, 6)}
+
+@lru_cache(maxsize=None)
+def _binomial_counts(periods: int) -> np.ndarray:
+    """Number of outcome paths with each number of up periods (0..periods)"""
+    return np.array([comb(periods, k) for k in range(periods + 1)])
+
+def _median_groups(values: np.ndarray, counts: np.ndarray) -> Tuple[int, int]:
+    """
+    Locate the median of a population given as distinct values and their counts
+    
+    Returns the indices into values of the two middle elements of the sorted
+    population; np.median averages them (they coincide for odd sizes).
+    """
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(counts[order])
+    size = cumulative[-1]
+    middle = np.searchsorted(cumulative, [(size - 1) // 2, size // 2], side='right')
+    return order[middle[0]], order[middle[1]]
+
+def _path_labels(sequences: np.ndarray) -> np.ndarray:
+    """Format each row of per-period returns as e.g. "+50% → -20%" in vectorized passes"""
+    step_labels = np.char.mod('%+.0f%%', sequences * 100)
+    return reduce(
+        lambda left, right: np.char.add(np.char.add(left, " → "), right),
+        step_labels.T
+    )
+
+@st.cache_data(max_entries=256)
+def calculate_single_scenario_outcomes(up_return: float, down_return: float, periods: int = 2) -> ScenarioOutcomes:
     """
     Calculate all possible outcomes for a single scenario over multiple periods
     
@@ -163,39 +335,39 @@ def calculate_single_scenario_outcomes(up_return: float, down_return: float, per
         periods: Number of periods
     
     Returns:
-        Dictionary with all outcomes and statistics
+        ScenarioOutcomes with all outcomes and statistics
     """
     
-    # Generate all possible sequences
-    from itertools import product
-    
-    sequences = list(product([up_return, down_return], repeat=periods))
-    outcomes = []
-    
-    for sequence in sequences:
-        terminal_value = 1.0
-        for return_rate in sequence:
-            terminal_value *= (1 + return_rate)
-        outcomes.append(terminal_value)
-    
-    outcomes = np.array(outcomes)
-    cagr_values = outcomes ** (1/periods) - 1
-    
-    # Calculate statistics
-    arithmetic_mean = 0.5 * up_return + 0.5 * down_return
-    geometric_mean = np.mean(cagr_values)
-    median_cagr = np.median(cagr_values)
-    
-    return {
-        'sequences': sequences,
-        'terminal_values': outcomes,
-        'cagr_values': cagr_values,
-        'arithmetic_mean': arithmetic_mean,
-        'geometric_mean': geometric_mean,
-        'median_cagr': median_cagr,
-        'mean_terminal': np.mean(outcomes),
-        'median_terminal': np.median(outcomes),
-        'prob_loss': np.sum(outcomes < 1.0) / len(outcomes),
-        'worst_case': np.min(outcomes),
-        'best_case': np.max(outcomes)
-    }
+    # Select up/down for every period of every path in one shot
+    mask = _OUTCOME_MASKS.get(periods)
+    if mask is None:
+        mask = _outcome_mask(periods)
+    
+    sequences = np.where(mask, up_return, down_return)
+    
+    # Paths with the same number of ups share a terminal value, so every
+    # statistic only needs one term per up count; the per-path arrays are
+    # gathered back out by each path's up count
+    ups = np.arange(periods + 1)
+    terminal_by_ups = (1 + up_return) ** ups * (1 + down_return) ** (periods - ups)
+    cagr_by_ups = terminal_by_ups ** (1/periods) - 1
+    counts = _binomial_counts(periods)
+    weights = counts / 2 ** periods
+    
+    path_ups = np.count_nonzero(mask, axis=1)
+    lower, upper = _median_groups(terminal_by_ups, counts)
+    
+    return ScenarioOutcomes(
+        sequences=sequences,
+        terminal_values=terminal_by_ups[path_ups],
+        cagr_values=cagr_by_ups[path_ups],
+        path_labels=_path_labels(sequences),
+        arithmetic_mean=0.5 * up_return + 0.5 * down_return,
+        geometric_mean=weights @ cagr_by_ups,
+        median_cagr=0.5 * (cagr_by_ups[lower] + cagr_by_ups[upper]),
+        mean_terminal=weights @ terminal_by_ups,
+        median_terminal=0.5 * (terminal_by_ups[lower] + terminal_by_ups[upper]),
+        prob_loss=weights[terminal_by_ups < 1.0].sum(),
+        worst_case=terminal_by_ups.min(),
+        best_case=terminal_by_ups.max()
+    )
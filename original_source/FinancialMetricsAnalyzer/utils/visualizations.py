@@ -1,10 +1,15 @@
+import copy
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from itertools import product
 from typing import Dict, List
 import streamlit as st
+from utils.calculations import ScenarioOutcomes
 
+@st.cache_resource(max_entries=64)
 def create_return_comparison_chart(scenarios_df: pd.DataFrame) -> go.Figure:
     """Create a chart comparing arithmetic vs geometric returns across volatility levels"""
     
@@ -55,18 +60,28 @@ def create_return_comparison_chart(scenarios_df: pd.DataFrame) -> go.Figure:
     
     return fig
 
+def _histogram_bar(values: np.ndarray, bins: int = 50, **bar_kwargs) -> go.Bar:
+    """Bin values in NumPy and return them as a bar trace, so only the bin counts are sent to the browser"""
+    counts, edges = np.histogram(values, bins=bins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        **bar_kwargs
+    )
+
 def create_simulation_histogram(results: Dict) -> go.Figure:
     """Create histogram of final values from Monte Carlo simulation"""
     
     fig = go.Figure()
     
     # Histogram of final values
-    fig.add_trace(go.Histogram(
-        x=results['final_values'],
-        nbinsx=50,
+    fig.add_trace(_histogram_bar(
+        results['final_values'],
         name='Final Values',
         opacity=0.7,
-        hovertemplate='Value Range: %{x}<br>Count: %{y}<extra></extra>'
+        hovertemplate='Value Range: %{customdata[0]:,.0f} - %{customdata[1]:,.0f}<br>Count: %{y}<extra></extra>'
     ))
     
     # Add vertical lines for statistics
@@ -99,12 +114,11 @@ def create_cagr_histogram(results: Dict) -> go.Figure:
     
     fig = go.Figure()
     
-    fig.add_trace(go.Histogram(
-        x=results['cagr_values'] * 100,  # Convert to percentage
-        nbinsx=50,
+    fig.add_trace(_histogram_bar(
+        results['cagr_values'] * 100,  # Convert to percentage
         name='CAGR Distribution',
         opacity=0.7,
-        hovertemplate='CAGR Range: %{x:.1f}%<br>Count: %{y}<extra></extra>'
+        hovertemplate='CAGR Range: %{customdata[0]:.1f}% - %{customdata[1]:.1f}%<br>Count: %{y}<extra></extra>'
     ))
     
     # Add vertical lines for statistics
@@ -116,10 +130,10 @@ def create_cagr_histogram(results: Dict) -> go.Figure:
     )
     
     fig.add_vline(
-        x=np.median(results['cagr_values']) * 100,
+        x=results['median_cagr'] * 100,
         line_dash="dash",
         line_color="red", 
-        annotation_text=f"Median CAGR: {np.median(results['cagr_values']):.1%}"
+        annotation_text=f"Median CAGR: {results['median_cagr']:.1%}"
     )
     
     fig.update_layout(
@@ -137,27 +151,31 @@ def create_path_visualization(results: Dict, num_paths: int = 100) -> go.Figure:
     
     fig = go.Figure()
     
-    # Sample random paths for visualization
-    paths_to_show = np.random.choice(len(results['all_paths']), 
-                                   min(num_paths, len(results['all_paths'])), 
-                                   replace=False)
-    
-    for i, path_idx in enumerate(paths_to_show):
-        path = results['all_paths'][path_idx]
-        periods = list(range(len(path)))
-        
-        fig.add_trace(go.Scatter(
-            x=periods,
-            y=path,
-            mode='lines',
-            line=dict(width=1, color='rgba(100,100,100,0.3)'),
-            showlegend=False,
-            hovertemplate='Period: %{x}<br>Value: $%{y:,.0f}<extra></extra>'
-        ))
+    # Paths are stored as a single (paths, periods + 1) array
+    all_paths = results['all_paths']
+    periods = np.arange(all_paths.shape[1])
+    
+    # Simulated paths are already independent random draws, so the first
+    # rows are a random sample and keep the chart stable across reruns
+    paths_to_show = all_paths[:num_paths]
+    
+    # Draw every sampled path as one WebGL trace, with a NaN point ending
+    # each path so the lines are not joined
+    num_shown = len(paths_to_show)
+    path_x = np.tile(np.append(periods, np.nan), num_shown)
+    path_y = np.column_stack([paths_to_show, np.full(num_shown, np.nan)]).ravel()
+    
+    fig.add_trace(go.Scattergl(
+        x=path_x,
+        y=path_y,
+        mode='lines',
+        line=dict(width=1, color='rgba(100,100,100,0.3)'),
+        showlegend=False,
+        hovertemplate='Period: %{x}<br>Value: $%{y:,.0f}<extra></extra>'
+    ))
     
     # Add median path
-    median_path = np.median(np.array(results['all_paths']), axis=0)
-    periods = list(range(len(median_path)))
+    median_path = np.median(all_paths, axis=0)
     
     fig.add_trace(go.Scatter(
         x=periods,
@@ -178,34 +196,19 @@ def create_path_visualization(results: Dict, num_paths: int = 100) -> go.Figure:
     
     return fig
 
-def create_outcome_tree_chart(outcomes_data: Dict) -> go.Figure:
-    """Create a tree chart showing all possible outcomes for a simple scenario"""
+@lru_cache(maxsize=5)
+def _build_tree_skeleton(periods: int) -> go.Figure:
+    """Build the outcome tree chart layout, which depends only on the number of periods"""
     
-    sequences = outcomes_data['sequences']
-    terminal_values = outcomes_data['terminal_values']
-    
-    # Create a simple bar chart of outcomes
-    outcome_labels = []
-    for i, seq in enumerate(sequences):
-        label = ""
-        for return_val in seq:
-            if return_val > 0:
-                label += "↑ "
-            else:
-                label += "↓ "
-        outcome_labels.append(label.strip())
+    # One label per sequence, in the same up-first order as the outcomes
+    outcome_labels = [" ".join(seq) for seq in product("↑↓", repeat=periods)]
     
     fig = go.Figure()
     
-    colors = ['green' if val >= 1.0 else 'red' for val in terminal_values]
-    
     fig.add_trace(go.Bar(
         x=outcome_labels,
-        y=terminal_values,
-        marker_color=colors,
         opacity=0.7,
-        hovertemplate='Sequence: %{x}<br>Terminal Value: %{y:.3f}<br>Return: %{customdata:.1%}<extra></extra>',
-        customdata=(terminal_values - 1)
+        hovertemplate='Sequence: %{x}<br>Terminal Value: %{y:.3f}<br>Return: %{customdata:.1%}<extra></extra>'
     ))
     
     # Add horizontal line at break-even
@@ -222,6 +225,21 @@ def create_outcome_tree_chart(outcomes_data: Dict) -> go.Figure:
     
     return fig
 
+@st.cache_resource(max_entries=64)
+def create_outcome_tree_chart(outcomes_data: ScenarioOutcomes) -> go.Figure:
+    """Create a tree chart showing all possible outcomes for a simple scenario"""
+    
+    terminal_values = outcomes_data.terminal_values
+    periods = outcomes_data.sequences.shape[1]
+    
+    # Reuse the cached layout and only fill in the values
+    fig = copy.deepcopy(_build_tree_skeleton(periods))
+    fig.data[0].y = terminal_values
+    fig.data[0].marker.color = np.where(terminal_values >= 1.0, 'green', 'red')
+    fig.data[0].customdata = terminal_values - 1
+    
+    return fig
+
 def create_percentile_chart(results: Dict) -> go.Figure:
     """Create a chart showing percentile distribution of outcomes"""
     